@@ -1,7 +1,12 @@
 DOMAIN = "light_presets"
 
-STORAGE_VERSION = 1
+# Version 2 split presets out of the index into per-category shards
+STORAGE_VERSION = 2
 STORAGE_KEY = "light_presets"
+# Per-category preset shards are stored under "<prefix>.<category id>"
+CATEGORY_STORAGE_KEY = f"{STORAGE_KEY}.category"
+# Seconds to wait before writing, so bursts of edits share one write
+SAVE_DELAY = 1
 
 # Preset types - named to match light.turn_on attribute names exactly
 PRESET_TYPE_COLOR_TEMP_KELVIN = "color_temp_kelvin"
@@ -15,6 +20,14 @@ PRESET_TYPES = [
     PRESET_TYPE_HS,
     PRESET_TYPE_BRIGHTNESS_ONLY,
 ]
+PRESET_TYPES_SET = frozenset(PRESET_TYPES)
+
+# light.turn_on color attribute set by each preset type (brightness_only: none)
+PRESET_TYPE_COLOR_ATTRS = {
+    PRESET_TYPE_COLOR_TEMP_KELVIN: "color_temp_kelvin",
+    PRESET_TYPE_RGB: "rgb_color",
+    PRESET_TYPE_HS: "hs_color",
+}
 
 # Service names - match rgb-light-card naming convention
 SERVICE_APPLY_COLOR = "applyColor"
@@ -1,22 +1,42 @@
 """Storage handler for light_presets."""
 from __future__ import annotations
 
+import asyncio
+import logging
+import sys
 import uuid
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, callback
 from homeassistant.helpers.storage import Store
 
 from .const import (
+    CATEGORY_STORAGE_KEY,
     DEFAULT_CATEGORY_NAME,
     DOMAIN,
+    PRESET_TYPE_COLOR_ATTRS,
+    SAVE_DELAY,
     STORAGE_KEY,
     STORAGE_VERSION,
 )
 
+_LOGGER = logging.getLogger(__name__)
+
+# save_preset fields copied onto the stored preset when given
+_PRESET_FIELDS = (
+    "name",
+    "type",
+    "brightness_pct",
+    "transition",
+    "color_temp_kelvin",
+    "rgb_color",
+    "hs_color",
+    "order",
+)
+
 
 def _new_id() -> str:
-    return str(uuid.uuid4())
+    return uuid.uuid4().hex
 
 
 def _empty_store() -> dict[str, Any]:
@@ -34,28 +54,200 @@ def _empty_store() -> dict[str, Any]:
     }
 
 
+def _build_service_data(preset: dict[str, Any]) -> dict[str, Any]:
+    """Build light.turn_on service data from preset attributes.
+
+    Only includes attributes relevant to the preset type.
+    """
+    service_data: dict[str, Any] = {}
+
+    if "brightness_pct" in preset:
+        service_data["brightness_pct"] = preset["brightness_pct"]
+    if "transition" in preset:
+        service_data["transition"] = preset["transition"]
+
+    color_attr = PRESET_TYPE_COLOR_ATTRS.get(preset["type"])
+    if color_attr is not None:
+        if color_attr in preset:
+            service_data[color_attr] = preset[color_attr]
+        else:
+            # Stored before save_preset required colors; still load it
+            _LOGGER.warning(
+                "light_presets: preset %s has type %s but no %s; "
+                "it will only set brightness",
+                preset["id"],
+                preset["type"],
+                color_attr,
+            )
+
+    return service_data
+
+
+def _validate_preset(preset: dict[str, Any]) -> None:
+    """Raise ValueError if the preset lacks the color its type needs."""
+    color_attr = PRESET_TYPE_COLOR_ATTRS.get(preset["type"])
+    if color_attr is not None and color_attr not in preset:
+        raise ValueError(f"Preset type {preset['type']} requires {color_attr}")
+
+
+def _remove_item(items: list[dict[str, Any]], item: dict[str, Any]) -> None:
+    """Remove item from items in place, matching by identity."""
+    for idx, existing in enumerate(items):
+        if existing is item:
+            del items[idx]
+            return
+
+
+def _category_shard(cat: dict[str, Any]) -> dict[str, Any]:
+    """Return the persisted form of a category's presets."""
+    return {"presets": cat["presets"]}
+
+
+def _index_entry(cat: dict[str, Any]) -> dict[str, Any]:
+    """Return the persisted index form of a category, without its presets."""
+    return {k: v for k, v in cat.items() if k != "presets"}
+
+
+def _new_category_store(hass: HomeAssistant, category_id: str) -> Store[dict[str, Any]]:
+    """Return a store for a category's presets shard."""
+    return Store(hass, STORAGE_VERSION, f"{CATEGORY_STORAGE_KEY}.{category_id}")
+
+
+class _IndexStore(Store[dict[str, Any]]):
+    """Category index store; migrates the single-file version 1 layout."""
+
+    migrated = False
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        old_minor_version: int,
+        old_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        if old_major_version == 1:
+            # Version 1 kept every category's presets in this file. Write
+            # them out as shards before the index stops carrying them.
+            cats = old_data["categories"]
+            await asyncio.gather(
+                *(
+                    _new_category_store(self.hass, c["id"]).async_save(
+                        _category_shard(c)
+                    )
+                    for c in cats
+                )
+            )
+            old_data = {
+                **old_data,
+                "version": STORAGE_VERSION,
+                "categories": [_index_entry(c) for c in cats],
+            }
+        self.migrated = True
+        return old_data
+
+
 class LightPresetsStore:
-    """Manages loading and saving of light presets to .storage."""
+    """Manages loading and saving of light presets to .storage.
+
+    The category list lives in one index file and each category's presets
+    in their own shard, so editing a preset only rewrites its category.
+    """
 
     def __init__(self, hass: HomeAssistant) -> None:
         self._hass = hass
-        self._store: Store[dict[str, Any]] = Store(
-            hass, STORAGE_VERSION, STORAGE_KEY
-        )
+        # Store already encodes with orjson via homeassistant.helpers.json,
+        # so no custom encoder is needed here or on the category shards.
+        self._store = _IndexStore(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._category_stores: dict[str, Store[dict[str, Any]]] = {}
+        # Edits waiting on the save delay, so a flush only writes those
+        self._index_dirty = False
+        self._dirty_categories: set[str] = set()
         self._data: dict[str, Any] = {}
+        # id -> category, and id -> (preset, containing category)
+        self._cat_by_id: dict[str, dict[str, Any]] = {}
+        self._preset_by_id: dict[str, tuple[dict[str, Any], dict[str, Any]]] = {}
+        # preset id -> prebuilt light.turn_on data; kept off the preset dicts
+        # so it is never persisted or returned by get_presets
+        self._service_data_by_id: dict[str, dict[str, Any]] = {}
 
     async def async_load(self) -> None:
         """Load data from storage, initialising if empty."""
         stored = await self._store.async_load()
         if stored is None:
+            # Nothing to lose yet, so don't hold up setup on a disk write
             self._data = _empty_store()
-            await self._store.async_save(self._data)
+            self.async_schedule_save()
         else:
             self._data = stored
+            if self._store.migrated:
+                # Persist the migrated index right away, so a restart never
+                # splits the old file again over newer shard edits
+                await self._store.async_save(self._index_to_save())
+            cats = self._data["categories"]
+            shards = await asyncio.gather(
+                *(self._category_store(c["id"]).async_load() for c in cats)
+            )
+            for cat, shard in zip(cats, shards):
+                cat["presets"] = shard["presets"] if shard is not None else []
+        self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        """Rebuild the id lookup tables from the category/preset tree."""
+        self._cat_by_id = {c["id"]: c for c in self._data["categories"]}
+        self._preset_by_id = {}
+        self._service_data_by_id = {}
+        for cat in self._data["categories"]:
+            for preset in cat["presets"]:
+                preset["type"] = sys.intern(preset["type"])
+                self._preset_by_id[preset["id"]] = (preset, cat)
+                self._service_data_by_id[preset["id"]] = _build_service_data(preset)
 
-    async def async_save(self) -> None:
-        """Persist current data to storage."""
-        await self._store.async_save(self._data)
+    def _category_store(self, category_id: str) -> Store[dict[str, Any]]:
+        """Return the shard store for a category, creating it if needed."""
+        store = self._category_stores.get(category_id)
+        if store is None:
+            store = _new_category_store(self._hass, category_id)
+            self._category_stores[category_id] = store
+        return store
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Schedule a delayed save of the category index."""
+        self._index_dirty = True
+        self._store.async_delay_save(self._index_to_save, SAVE_DELAY)
+
+    @callback
+    def async_schedule_category_save(self, cat: dict[str, Any]) -> None:
+        """Schedule a delayed save of a single category's presets."""
+        self._dirty_categories.add(cat["id"])
+        self._category_store(cat["id"]).async_delay_save(
+            lambda: self._shard_to_save(cat), SAVE_DELAY
+        )
+
+    async def async_flush(self) -> None:
+        """Persist any edits still waiting on the save delay."""
+        dirty = [self._cat_by_id[c] for c in self._dirty_categories]
+        # Shards first, so the index never points at presets not yet written
+        await asyncio.gather(
+            *(
+                self._category_store(cat["id"]).async_save(self._shard_to_save(cat))
+                for cat in dirty
+            )
+        )
+        if self._index_dirty:
+            await self._store.async_save(self._index_to_save())
+
+    @callback
+    def _shard_to_save(self, cat: dict[str, Any]) -> dict[str, Any]:
+        self._dirty_categories.discard(cat["id"])
+        return _category_shard(cat)
+
+    @callback
+    def _index_to_save(self) -> dict[str, Any]:
+        self._index_dirty = False
+        return {
+            **self._data,
+            "categories": [_index_entry(c) for c in self._data["categories"]],
+        }
 
     # ------------------------------------------------------------------
     # Read helpers
@@ -66,21 +258,15 @@ class LightPresetsStore:
         return self._data
 
     def _find_category(self, category_id: str) -> dict[str, Any] | None:
-        for cat in self._data["categories"]:
-            if cat["id"] == category_id:
-                return cat
-        return None
+        return self._cat_by_id.get(category_id)
 
     def _find_preset(
         self, category_id: str, preset_id: str
     ) -> dict[str, Any] | None:
-        cat = self._find_category(category_id)
-        if cat is None:
+        entry = self._preset_by_id.get(preset_id)
+        if entry is None or entry[1]["id"] != category_id:
             return None
-        for preset in cat["presets"]:
-            if preset["id"] == preset_id:
-                return preset
-        return None
+        return entry[0]
 
     # ------------------------------------------------------------------
     # Category operations
@@ -100,6 +286,7 @@ class LightPresetsStore:
                 "presets": [],
             }
             self._data["categories"].append(cat)
+            self._cat_by_id[cat["id"]] = cat
         else:
             cat = self._find_category(category_id)
             if cat is None:
@@ -107,14 +294,26 @@ class LightPresetsStore:
             cat["name"] = name
             if order is not None:
                 cat["order"] = order
-        await self.async_save()
+        # Name and order live in the index; the presets shard is untouched
+        self.async_schedule_save()
         return cat
 
     async def async_delete_category(self, category_id: str) -> None:
         """Delete a category and all its presets."""
-        cats = self._data["categories"]
-        self._data["categories"] = [c for c in cats if c["id"] != category_id]
-        await self.async_save()
+        cat = self._cat_by_id.pop(category_id, None)
+        if cat is None:
+            return
+        for preset in cat["presets"]:
+            self._preset_by_id.pop(preset["id"], None)
+            self._service_data_by_id.pop(preset["id"], None)
+        _remove_item(self._data["categories"], cat)
+        self._dirty_categories.discard(category_id)
+        # Save the index before dropping the shard, so a crash in between
+        # can't bring the category back empty
+        await self._store.async_save(self._index_to_save())
+        shard = self._category_stores.pop(category_id, None)
+        if shard is not None:
+            await shard.async_remove()
 
     # ------------------------------------------------------------------
     # Preset operations
@@ -131,20 +330,27 @@ class LightPresetsStore:
         if cat is None:
             raise ValueError(f"Category {category_id} not found")
 
+        # Share identity with the PRESET_TYPE_* constants, as on load
+        preset_data["type"] = sys.intern(preset_data["type"])
+
         if preset_id is None:
             # Create
+            _validate_preset(preset_data)
             preset: dict[str, Any] = {
                 "id": _new_id(),
                 "order": len(cat["presets"]),
                 **preset_data,
             }
             cat["presets"].append(preset)
+            self._preset_by_id[preset["id"]] = (preset, cat)
         else:
             preset = self._find_preset(category_id, preset_id)
             if preset is None:
                 raise ValueError(f"Preset {preset_id} not found in category {category_id}")
+            _validate_preset({**preset, **preset_data})
             preset.update(preset_data)
-        await self.async_save()
+        self._service_data_by_id[preset["id"]] = _build_service_data(preset)
+        self.async_schedule_category_save(cat)
         return preset
 
     async def async_delete_preset(
@@ -154,13 +360,73 @@ class LightPresetsStore:
         cat = self._find_category(category_id)
         if cat is None:
             raise ValueError(f"Category {category_id} not found")
-        cat["presets"] = [p for p in cat["presets"] if p["id"] != preset_id]
-        await self.async_save()
+        preset = self._find_preset(category_id, preset_id)
+        if preset is None:
+            return
+        del self._preset_by_id[preset_id]
+        del self._service_data_by_id[preset_id]
+        _remove_item(cat["presets"], preset)
+        self.async_schedule_category_save(cat)
 
     def get_preset_by_id(self, preset_id: str) -> dict[str, Any] | None:
         """Find a preset by id across all categories."""
-        for cat in self._data["categories"]:
-            for preset in cat["presets"]:
-                if preset["id"] == preset_id:
-                    return preset
-        return None
+        entry = self._preset_by_id.get(preset_id)
+        return entry[0] if entry is not None else None
+
+    # ------------------------------------------------------------------
+    # Service handlers
+    # Registered directly as bound methods, see _SERVICE_TABLE.
+    # ------------------------------------------------------------------
+
+    async def handle_get_presets(self, call: ServiceCall) -> ServiceResponse:
+        """Service get_presets: return the full category/preset tree."""
+        return self.get_all()
+
+    async def handle_apply_color(self, call: ServiceCall) -> None:
+        """Service applyColor: apply a preset by id to one or more lights.
+
+        Matches rgb-light-card's applyColor naming convention.
+        """
+        preset_id: str = call.data["preset_id"]
+        entity_ids: list[str] = call.data["entity_id"]
+
+        service_data = self._service_data_by_id.get(preset_id)
+        if service_data is None:
+            _LOGGER.error("light_presets.applyColor: preset %s not found", preset_id)
+            return
+
+        # light.turn_on accepts a list of entities, so dispatch once
+        # rather than once per light.
+        await self._hass.services.async_call(
+            "light",
+            "turn_on",
+            {"entity_id": entity_ids, **service_data},
+        )
+
+    async def handle_save_category(self, call: ServiceCall) -> ServiceResponse:
+        """Service save_category: create or update (with category_id) a category."""
+        return await self.async_save_category(
+            category_id=call.data.get("category_id"),
+            name=call.data["name"],
+            order=call.data.get("order"),
+        )
+
+    async def handle_delete_category(self, call: ServiceCall) -> None:
+        """Service delete_category."""
+        await self.async_delete_category(call.data["category_id"])
+
+    async def handle_save_preset(self, call: ServiceCall) -> ServiceResponse:
+        """Service save_preset: create or update (with preset_id) a preset."""
+        preset_data = {k: call.data[k] for k in _PRESET_FIELDS if k in call.data}
+        return await self.async_save_preset(
+            category_id=call.data["category_id"],
+            preset_id=call.data.get("preset_id"),
+            preset_data=preset_data,
+        )
+
+    async def handle_delete_preset(self, call: ServiceCall) -> None:
+        """Service delete_preset."""
+        await self.async_delete_preset(
+            category_id=call.data["category_id"],
+            preset_id=call.data["preset_id"],
+        )